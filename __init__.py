@@ -11,14 +11,21 @@ Storage: Uses Anki tags with prefix "sibling::" for native sync support.
 from aqt import mw, gui_hooks
 from aqt.qt import QAction, QMenu, QInputDialog, QMessageBox
 from aqt.browser import Browser
+from aqt.operations import CollectionOp
 from aqt.utils import showInfo, tooltip
 from anki.cards import Card
+from anki.notes import Note
+from anki.collection import Collection, OpChangesWithCount
+from anki.utils import ids2str
 import os
 import json
+import logging
 import re
+import sys
 import traceback
-from typing import Optional, List, Set
-from datetime import datetime
+import uuid
+from collections import defaultdict
+from typing import Optional, List, Set, Dict
 
 # =============================================================================
 # CONFIGURATION
@@ -28,18 +35,36 @@ ADDON_NAME = "Sibling Marker"
 TAG_PREFIX = "sibling::"
 SUSPENDED_TAG_PREFIX = "sibling-suspended::"
 DEBUG_MODE = False
+GROUP_CACHE_MAX_SIZE = 256
 
 # =============================================================================
 # LOGGING
 # =============================================================================
 
+# Messages below the logger level are dropped before any formatting happens
+_logger = logging.getLogger("sibling_marker")
+_logger.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
+if not _logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter(
+        f"[{ADDON_NAME}] [%(levelname)s] %(asctime)s: %(message)s", "%H:%M:%S"
+    ))
+    _logger.addHandler(_handler)
+    _logger.propagate = False
+
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
 def log(message: str, level: str = "INFO") -> None:
     """Log a message to console."""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    full_msg = f"[{ADDON_NAME}] [{level}] {timestamp}: {message}"
-    print(full_msg)
+    _logger.log(_LOG_LEVELS.get(level, logging.INFO), message)
     if DEBUG_MODE and level == "ERROR":
-        tooltip(f"Sibling Marker Error: {message}")
+        # May be called from a background operation; tooltips need the UI thread
+        mw.taskman.run_on_main(lambda: tooltip(f"Sibling Marker Error: {message}"))
 
 def log_error(message: str, exc: Optional[Exception] = None) -> None:
     """Log an error with optional exception details."""
@@ -52,18 +77,26 @@ def log_error(message: str, exc: Optional[Exception] = None) -> None:
 # TAG UTILITIES
 # =============================================================================
 
+_RE_NONWORD = re.compile(r'[^\w\-:]')
+_RE_COLONS = re.compile(r':+')
+_RE_USCORES = re.compile(r'_+')
+
 def sanitize_group_name(name: str) -> str:
     """Sanitize a group name for use in tags. Preserves :: for hierarchy."""
     # Replace spaces and special chars with underscores, but keep : for hierarchy
-    sanitized = re.sub(r'[^\w\-:]', '_', name)
+    sanitized = _RE_NONWORD.sub('_', name)
     # Normalize multiple colons to exactly two (for hierarchy)
-    sanitized = re.sub(r':+', '::', sanitized)
+    sanitized = _RE_COLONS.sub('::', sanitized)
     # Remove consecutive underscores
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _RE_USCORES.sub('_', sanitized)
     # Remove leading/trailing underscores and colons
     sanitized = sanitized.strip('_:')
     return sanitized.lower() if sanitized else None
 
+def resolve_group_name(name: Optional[str]) -> str:
+    """Sanitize a requested group name, generating an ID if none is usable."""
+    return (sanitize_group_name(name) if name else None) or generate_group_id()
+
 def get_sibling_tag(group_name: str) -> str:
     """Create a sibling tag from a group name."""
     return f"{TAG_PREFIX}{group_name}"
@@ -76,27 +109,77 @@ def extract_group_name(tag: str) -> Optional[str]:
 
 def get_sibling_tags_for_note(note) -> List[str]:
     """Get all sibling tags for a note."""
+    # Most notes have no sibling tags; a substring test on the joined tags
+    # rules them out without a Python-level scan of the list
+    if TAG_PREFIX not in " ".join(note.tags):
+        return []
     return [t for t in note.tags if t.startswith(TAG_PREFIX)]
 
+def tag_like_pattern(tag: str) -> str:
+    """LIKE pattern matching a whole tag in the space-padded notes.tags column.
+    Use with ESCAPE '\\'."""
+    escaped = tag.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"% {escaped} %"
+
 def generate_group_id() -> str:
     """Generate a unique group ID."""
-    import uuid
-    return str(uuid.uuid4())[:8]
+    return uuid.uuid4().hex[:8]
 
 # =============================================================================
 # SYNC CHECK TIMESTAMP
 # =============================================================================
 
-def get_last_sync_check_time() -> int:
+def get_last_sync_check_time(col: Optional[Collection] = None) -> int:
     """Get timestamp of last revlog check (milliseconds)."""
-    if mw.col is None:
+    col = col or mw.col
+    if col is None:
         return 0
-    return mw.col.get_config("sibling_marker_last_check", 0)
+    return col.get_config("sibling_marker_last_check", 0)
 
-def set_last_sync_check_time(timestamp: int) -> None:
+def set_last_sync_check_time(timestamp: int, col: Optional[Collection] = None) -> None:
     """Store timestamp of last revlog check."""
-    if mw.col is not None:
-        mw.col.set_config("sibling_marker_last_check", timestamp)
+    col = col or mw.col
+    if col is not None:
+        col.set_config("sibling_marker_last_check", timestamp)
+
+# =============================================================================
+# GROUP CACHES
+# =============================================================================
+
+# All caches are cleared from the operation_did_execute hook whenever notes,
+# tags or note types change, and after sync / profile load.
+
+# group_name -> card IDs, used on the reviewer hot path so group membership
+# isn't recomputed on every answer.
+_group_cards_cache: Dict[str, List[int]] = {}
+
+# group_name -> note IDs for all groups, as returned by get_all_sibling_groups
+_all_groups_cache: Optional[Dict[str, List[int]]] = None
+
+# IDs of all notes in any group, for an O(1) check in the reviewer hook
+_sibling_nids_cache: Optional[Set[int]] = None
+
+def invalidate_group_cache() -> None:
+    """Drop all cached group membership."""
+    global _all_groups_cache, _sibling_nids_cache
+    _group_cards_cache.clear()
+    _all_groups_cache = None
+    _sibling_nids_cache = None
+
+def get_cached_cards_for_sibling_group(group_name: str,
+                                       col: Optional[Collection] = None) -> List[int]:
+    """Get all card IDs in a sibling group, using the cache when possible."""
+    card_ids = _group_cards_cache.get(group_name)
+    if card_ids is not None:
+        return card_ids
+    
+    card_ids = get_cards_for_sibling_group(group_name, col)
+    
+    # Evict the oldest entry once the cache is full
+    if len(_group_cards_cache) >= GROUP_CACHE_MAX_SIZE:
+        _group_cards_cache.pop(next(iter(_group_cards_cache)))
+    _group_cards_cache[group_name] = card_ids
+    return card_ids
 
 # =============================================================================
 # CORE FUNCTIONS
@@ -104,47 +187,90 @@ def set_last_sync_check_time(timestamp: int) -> None:
 
 def get_all_sibling_groups() -> dict:
     """
-    Get all sibling groups from the collection.
+    Get all sibling groups from the collection (cached until notes change).
     Returns dict: {group_name: [note_id, ...]}
     """
+    global _all_groups_cache
     if mw.col is None:
         return {}
     
-    groups = {}
-    # Find all notes with sibling tags
-    note_ids = mw.col.find_notes(f"tag:{TAG_PREFIX}*")
+    if _all_groups_cache is not None:
+        return _all_groups_cache
     
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            for tag in get_sibling_tags_for_note(note):
-                group_name = extract_group_name(tag)
-                if group_name:
-                    if group_name not in groups:
-                        groups[group_name] = []
-                    groups[group_name].append(nid)
-        except Exception as e:
-            log_error(f"Error reading note {nid}", e)
+    groups = defaultdict(list)
+    # Read the raw tag strings of all notes with sibling tags in one query,
+    # instead of loading every note. Anki stores tags space-padded.
+    rows = mw.col.db.all(
+        "SELECT id, tags FROM notes WHERE tags LIKE ?", f"% {TAG_PREFIX}%"
+    )
+    
+    for nid, tags in rows:
+        for tag in tags.split():
+            group_name = extract_group_name(tag)
+            if group_name:
+                groups[group_name].append(nid)
     
-    return groups
+    _all_groups_cache = dict(groups)
+    return _all_groups_cache
+
+def get_all_sibling_note_ids() -> Set[int]:
+    """Get the IDs of all notes in any sibling group (cached until notes change)."""
+    global _sibling_nids_cache
+    if _sibling_nids_cache is None:
+        _sibling_nids_cache = set()
+        for note_ids in get_all_sibling_groups().values():
+            _sibling_nids_cache.update(note_ids)
+    return _sibling_nids_cache
+
+def get_sibling_group_counts() -> Dict[str, int]:
+    """
+    Get the number of notes in each sibling group.
+    Returns dict: {group_name: note_count}
+    """
+    return {
+        group_name: len(note_ids)
+        for group_name, note_ids in get_all_sibling_groups().items()
+    }
 
-def get_cards_for_sibling_group(group_name: str) -> List[int]:
+def get_cards_for_sibling_group(group_name: str,
+                                col: Optional[Collection] = None) -> List[int]:
     """Get all card IDs in a sibling group."""
-    if mw.col is None:
+    col = col or mw.col
+    if col is None:
         return []
     
     tag = get_sibling_tag(group_name)
-    note_ids = mw.col.find_notes(f"tag:{tag}")
+    return col.db.list(
+        "SELECT c.id FROM cards c JOIN notes n ON c.nid = n.id "
+        "WHERE n.tags LIKE ? ESCAPE '\\'",
+        tag_like_pattern(tag)
+    )
+
+def get_note_ids_for_cards(card_ids: List[int]) -> Set[int]:
+    """Get the unique note IDs of a list of cards (deleted cards are skipped)."""
+    if mw.col is None:
+        return set()
     
-    card_ids = []
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            card_ids.extend(note.card_ids())
-        except Exception as e:
-            log_error(f"Error getting cards for note {nid}", e)
+    return set(mw.col.db.list(
+        f"SELECT DISTINCT nid FROM cards WHERE id IN {ids2str(card_ids)}"
+    ))
+
+def get_sibling_tags_for_note_ids(note_ids: Set[int]) -> Dict[int, List[str]]:
+    """
+    Get the sibling tags of several notes from their raw tag strings,
+    in one query and without loading the notes.
+    Returns dict: {note_id: [tag, ...]}
+    """
+    if mw.col is None:
+        return {}
     
-    return card_ids
+    rows = mw.col.db.all(
+        f"SELECT id, tags FROM notes WHERE id IN {ids2str(note_ids)}"
+    )
+    return {
+        nid: [t for t in tags.split() if t.startswith(TAG_PREFIX)]
+        for nid, tags in rows
+    }
 
 def get_sibling_groups_for_card(card_id: int) -> List[str]:
     """Get all sibling group names that a card belongs to."""
@@ -179,13 +305,7 @@ def mark_cards_as_siblings(card_ids: List[int], group_name: Optional[str] = None
         return False
     
     # Get notes for selected cards (deduplicated)
-    note_ids: Set[int] = set()
-    for cid in card_ids:
-        try:
-            card = mw.col.get_card(cid)
-            note_ids.add(card.nid)
-        except Exception as e:
-            log_error(f"Error getting note for card {cid}", e)
+    note_ids = get_note_ids_for_cards(card_ids)
     
     if len(note_ids) < 2:
         showInfo("Selected cards belong to fewer than 2 notes. "
@@ -194,14 +314,11 @@ def mark_cards_as_siblings(card_ids: List[int], group_name: Optional[str] = None
     
     # Check if any notes already have sibling tags
     existing_groups: Set[str] = set()
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            for group in [extract_group_name(t) for t in get_sibling_tags_for_note(note)]:
-                if group:
-                    existing_groups.add(group)
-        except Exception:
-            pass
+    for sibling_tags in get_sibling_tags_for_note_ids(note_ids).values():
+        for tag in sibling_tags:
+            group = extract_group_name(tag)
+            if group:
+                existing_groups.add(group)
     
     final_group_name: str
     
@@ -230,40 +347,39 @@ def mark_cards_as_siblings(card_ids: List[int], group_name: Optional[str] = None
         if reply == cancel_val:
             return False
         elif reply == yes_val:
-            final_group_name = list(existing_groups)[0]
+            final_group_name = next(iter(existing_groups))
         else:
             final_group_name = generate_group_id()
-    elif group_name:
-        sanitized = sanitize_group_name(group_name)
-        final_group_name = sanitized if sanitized else generate_group_id()
     else:
-        final_group_name = generate_group_id()
+        final_group_name = resolve_group_name(group_name)
     
-    # Add tag to all notes
     tag = get_sibling_tag(final_group_name)
-    modified_count = 0
-    
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            if tag not in note.tags:
-                note.tags.append(tag)
-                mw.col.update_note(note)
-                modified_count += 1
-        except Exception as e:
-            log_error(f"Error updating note {nid}", e)
     
-    if modified_count > 0:
-        tooltip(f"Marked {len(note_ids)} notes as siblings (group: {final_group_name})")
-        log(f"Added sibling tag '{tag}' to {modified_count} notes")
+    def mark(col: Collection) -> OpChangesWithCount:
+        # Tagging and the separation it triggers share one undo step, so
+        # undo can't leave a card suspended without its sibling-suspended tag
+        undo_entry = col.add_custom_undo_entry("Mark as Siblings")
         
-        # Apply cross-platform sibling separation
-        apply_sibling_separation(final_group_name, card_ids)
+        # Add tag to all notes in one backend call (no-op for notes already tagged)
+        tagged = col.tags.bulk_add(list(note_ids), tag).count
+        if tagged > 0:
+            # Apply cross-platform sibling separation
+            apply_sibling_separation(final_group_name, card_ids, col)
         
-        return True
-    else:
-        tooltip("Notes were already in this sibling group")
-        return True
+        return OpChangesWithCount(
+            count=tagged, changes=col.merge_undo_entries(undo_entry)
+        )
+    
+    def on_success(changes: OpChangesWithCount) -> None:
+        if changes.count > 0:
+            tooltip(f"Marked {len(note_ids)} notes as siblings (group: {final_group_name})")
+            log(f"Added sibling tag '{tag}' to {changes.count} notes")
+        else:
+            tooltip("Notes were already in this sibling group")
+    
+    CollectionOp(parent=mw, op=mark).success(on_success).run_in_background()
+    
+    return True
 
 def remove_from_sibling_group(card_ids: List[int]) -> bool:
     """Remove cards' notes from their sibling groups."""
@@ -272,31 +388,28 @@ def remove_from_sibling_group(card_ids: List[int]) -> bool:
         return False
     
     # Get unique notes
-    note_ids: Set[int] = set()
-    for cid in card_ids:
-        try:
-            card = mw.col.get_card(cid)
-            note_ids.add(card.nid)
-        except Exception:
-            pass
+    note_ids = get_note_ids_for_cards(card_ids)
     
-    removed_count = 0
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            sibling_tags = get_sibling_tags_for_note(note)
-            if sibling_tags:
-                for tag in sibling_tags:
-                    note.tags.remove(tag)
-                mw.col.update_note(note)
-                removed_count += 1
-        except Exception as e:
-            log_error(f"Error removing tags from note {nid}", e)
+    # Collect every sibling tag on the selected notes
+    sibling_tags: Set[str] = set()
+    for note_tags in get_sibling_tags_for_note_ids(note_ids).values():
+        sibling_tags.update(note_tags)
     
-    if removed_count > 0:
-        tooltip(f"Removed {removed_count} note(s) from sibling groups")
-    else:
+    if not sibling_tags:
         tooltip("Selected cards were not in any sibling groups")
+        return True
+    
+    def on_success(changes) -> None:
+        if changes.count > 0:
+            tooltip(f"Removed {changes.count} note(s) from sibling groups")
+        else:
+            tooltip("Selected cards were not in any sibling groups")
+    
+    # Remove them all in one transaction and undo step
+    CollectionOp(
+        parent=mw,
+        op=lambda col: col.tags.bulk_remove(list(note_ids), " ".join(sibling_tags))
+    ).success(on_success).run_in_background()
     
     return True
 
@@ -307,25 +420,16 @@ def show_sibling_info(card_ids: List[int]) -> None:
         return
     
     info_lines = []
-    seen_notes: Set[int] = set()
+    tags_by_note = get_sibling_tags_for_note_ids(get_note_ids_for_cards(card_ids))
     
-    for cid in card_ids:
-        try:
-            card = mw.col.get_card(cid)
-            if card.nid in seen_notes:
-                continue
-            seen_notes.add(card.nid)
-            
-            note = card.note()
-            groups = [extract_group_name(t) for t in get_sibling_tags_for_note(note)]
-            groups = [g for g in groups if g]
-            
-            if groups:
-                info_lines.append(f"Note {card.nid}: Groups: {', '.join(groups)}")
-            else:
-                info_lines.append(f"Note {card.nid}: Not in any sibling group")
-        except Exception as e:
-            info_lines.append(f"Card {cid}: Error - {e}")
+    for nid, sibling_tags in sorted(tags_by_note.items()):
+        groups = [extract_group_name(t) for t in sibling_tags]
+        groups = [g for g in groups if g]
+        
+        if groups:
+            info_lines.append(f"Note {nid}: Groups: {', '.join(groups)}")
+        else:
+            info_lines.append(f"Note {nid}: Not in any sibling group")
     
     showInfo("\n".join(info_lines), title="Sibling Group Info")
 
@@ -335,51 +439,41 @@ def add_to_existing_group(card_ids: List[int], browser: Browser) -> bool:
         showInfo("Please open a collection first.")
         return False
     
-    groups = get_all_sibling_groups()
+    group_counts = get_sibling_group_counts()
     
-    if not groups:
+    if not group_counts:
         showInfo("No existing sibling groups. Use 'Mark as Siblings' first.")
         return False
     
-    group_info = [f"{name} ({len(nids)} notes)" for name, nids in groups.items()]
-    group_names = list(groups.keys())
+    # Display label -> group name
+    group_by_label = {
+        f"{name} ({count} notes)": name for name, count in group_counts.items()
+    }
     
     choice, ok = QInputDialog.getItem(
         browser, "Select Group", "Add to which sibling group?",
-        group_info, 0, False
+        list(group_by_label), 0, False
     )
     
     if not (ok and choice):
         return False
     
-    group_name = group_names[group_info.index(choice)]
+    group_name = group_by_label[choice]
     tag = get_sibling_tag(group_name)
     
     # Get unique notes
-    note_ids: Set[int] = set()
-    for cid in card_ids:
-        try:
-            card = mw.col.get_card(cid)
-            note_ids.add(card.nid)
-        except Exception:
-            pass
+    note_ids = get_note_ids_for_cards(card_ids)
     
-    # Add tag to notes
-    added_count = 0
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            if tag not in note.tags:
-                note.tags.append(tag)
-                mw.col.update_note(note)
-                added_count += 1
-        except Exception as e:
-            log_error(f"Error updating note {nid}", e)
+    def on_success(changes) -> None:
+        if changes.count > 0:
+            tooltip(f"Added {changes.count} note(s) to group '{group_name}'")
+        else:
+            tooltip("Notes were already in this group")
     
-    if added_count > 0:
-        tooltip(f"Added {added_count} note(s) to group '{group_name}'")
-    else:
-        tooltip("Notes were already in this group")
+    # Add tag to notes in one transaction and undo step
+    CollectionOp(
+        parent=browser, op=lambda col: col.tags.bulk_add(list(note_ids), tag)
+    ).success(on_success).run_in_background()
     
     return True
 
@@ -387,126 +481,150 @@ def add_to_existing_group(card_ids: List[int], browser: Browser) -> bool:
 # BURY LOGIC
 # =============================================================================
 
-def bury_custom_siblings(card: Card) -> int:
-    """Bury custom siblings when a card is answered."""
+def bury_siblings_of_notes(col: Collection,
+                           reviewed_nids_by_group: Dict[str, Set[int]],
+                           use_cache: bool = True) -> OpChangesWithCount:
+    """
+    Bury the custom siblings of reviewed notes.
+    Takes dict: {group_name: {reviewed_note_id, ...}}
+    A card in a group is buried if a note other than its own was reviewed.
+    Pass use_cache=False off the main thread, where the group cache may be
+    invalidated concurrently.
+    Returns the bury changes; .count is the number of cards buried.
+    """
+    # Get all sibling cards from all groups involved
+    get_group_cards = (
+        get_cached_cards_for_sibling_group if use_cache
+        else get_cards_for_sibling_group
+    )
+    group_cids = {
+        group_name: get_group_cards(group_name, col)
+        for group_name in reviewed_nids_by_group
+    }
+    sibling_cids: Set[int] = set()
+    for cids in group_cids.values():
+        sibling_cids.update(cids)
+    
+    if not sibling_cids:
+        return OpChangesWithCount()
+    
+    # Only bury active cards (not already buried/suspended): new and
+    # learning always, review and day learning if due
+    active_nid_by_cid = dict(col.db.all(
+        f"SELECT id, nid FROM cards WHERE id IN {ids2str(sibling_cids)} "
+        "AND (queue IN (0, 1) OR (queue IN (2, 3) AND due <= ?))",
+        col.sched.today
+    ))
+    
+    cards_to_bury: List[int] = []
+    for group_name, reviewed_nids in reviewed_nids_by_group.items():
+        for cid in group_cids[group_name]:
+            nid = active_nid_by_cid.get(cid)
+            # Cards on the reviewed note itself are native siblings
+            if nid is not None and (len(reviewed_nids) > 1 or nid not in reviewed_nids):
+                cards_to_bury.append(cid)
+    
+    # A card in several groups is collected once per group
+    cards_to_bury = list(dict.fromkeys(cards_to_bury))
+    
+    if not cards_to_bury:
+        return OpChangesWithCount()
+    
+    # Bury all at once
+    changes = col.sched.bury_cards(cards_to_bury)
+    log(f"Buried {len(cards_to_bury)} custom sibling(s)")
+    return changes
+
+def bury_custom_siblings(card: Card, sibling_tags: Optional[List[str]] = None) -> int:
+    """
+    Bury custom siblings when a card is answered.
+    Pass the note's sibling tags if already known to skip looking them up.
+    """
     if not card or mw.col is None:
         return 0
     
     try:
-        note = card.note()
-        sibling_tags = get_sibling_tags_for_note(note)
-        
-        if not sibling_tags:
-            return 0
+        if sibling_tags is None:
+            sibling_tags = get_sibling_tags_for_note_ids({card.nid}).get(card.nid, [])
         
-        col = mw.col
-        cards_to_bury: Set[int] = set()
-        
-        # Get all sibling cards from all groups this card belongs to
+        reviewed_nids_by_group: Dict[str, Set[int]] = {}
         for tag in sibling_tags:
             group_name = extract_group_name(tag)
-            if not group_name:
-                continue
-            
-            # Find all notes with this tag
-            note_ids = col.find_notes(f"tag:{tag}")
-            
-            for nid in note_ids:
-                if nid == card.nid:
-                    continue  # Skip the current card's note
-                
-                try:
-                    sibling_note = col.get_note(nid)
-                    for sib_cid in sibling_note.card_ids():
-                        if sib_cid == card.id:
-                            continue
-                        
-                        sib_card = col.get_card(sib_cid)
-                        
-                        # Only bury if card is active (not already buried/suspended)
-                        if sib_card.queue >= 0:
-                            should_bury = False
-                            
-                            if sib_card.queue == 0:  # New
-                                should_bury = True
-                            elif sib_card.queue == 1:  # Learning
-                                should_bury = True
-                            elif sib_card.queue == 2:  # Review - due today
-                                should_bury = sib_card.due <= col.sched.today
-                            elif sib_card.queue == 3:  # Day learning
-                                should_bury = sib_card.due <= col.sched.today
-                            
-                            if should_bury:
-                                cards_to_bury.add(sib_cid)
-                except Exception as e:
-                    log(f"Error checking sibling card: {e}", "WARN")
-        
-        # Bury all at once
-        if cards_to_bury:
-            col.sched.bury_cards(list(cards_to_bury))
-            log(f"Buried {len(cards_to_bury)} custom sibling(s)")
-            return len(cards_to_bury)
+            if group_name:
+                reviewed_nids_by_group[group_name] = {card.nid}
         
-        return 0
+        if not reviewed_nids_by_group:
+            return 0
+        
+        return bury_siblings_of_notes(mw.col, reviewed_nids_by_group).count
         
     except Exception as e:
         log_error("Error in bury_custom_siblings", e)
         return 0
 
-def process_reviews_since_last_check() -> int:
+def process_reviews_since_last_check(col: Collection) -> OpChangesWithCount:
     """Check revlog for reviews since last check and bury siblings.
     
     This handles reviews that happened on mobile or other devices.
+    Runs on a background thread via CollectionOp.
     """
-    if mw.col is None:
-        return 0
-
-    last_check = get_last_sync_check_time()
+    last_check = get_last_sync_check_time(col)
 
-    # Query revlog for reviews since last check
+    # Query revlog for reviews since last check, joined to the reviewed notes'
+    # tags so reviews of notes without sibling tags never leave SQLite.
     # revlog.id is the timestamp in milliseconds
-    reviews = mw.col.db.list(
-        "SELECT DISTINCT cid FROM revlog WHERE id > ?", last_check
+    reviews = col.db.all(
+        "SELECT DISTINCT n.id, n.tags FROM revlog r "
+        "JOIN cards c ON c.id = r.cid JOIN notes n ON n.id = c.nid "
+        "WHERE r.id > ? AND n.tags LIKE ?",
+        last_check, f"% {TAG_PREFIX}%"
     )
 
-    if not reviews:
-        # Update timestamp even if no reviews, so we don't re-check old ones
-        import time
-        set_last_sync_check_time(int(time.time() * 1000))
-        return 0
+    # Collect the reviewed notes of every group, then bury in one pass
+    reviewed_nids_by_group: Dict[str, Set[int]] = defaultdict(set)
+    for nid, tags in reviews:
+        for tag in tags.split():
+            group_name = extract_group_name(tag)
+            if group_name:
+                reviewed_nids_by_group[group_name].add(nid)
 
-    total_buried = 0
-    for cid in reviews:
+    changes = OpChangesWithCount()
+    if reviewed_nids_by_group:
         try:
-            card = mw.col.get_card(cid)
-            buried = bury_custom_siblings(card)
-            total_buried += buried
-        except Exception:
-            pass  # Card may have been deleted
+            # Runs on a worker thread, so read membership directly
+            # rather than racing the main thread's cache invalidation
+            changes = bury_siblings_of_notes(
+                col, reviewed_nids_by_group, use_cache=False
+            )
+        except Exception as e:
+            log_error("Error burying siblings of synced reviews", e)
 
-    # Update last check time to now (in milliseconds)
+    # Update last check time to now (in milliseconds), even if there were
+    # no reviews, so we don't re-check old ones
     import time
-    set_last_sync_check_time(int(time.time() * 1000))
+    set_last_sync_check_time(int(time.time() * 1000), col)
 
-    return total_buried
+    return changes
 
 # =============================================================================
 # CROSS-PLATFORM SIBLING SEPARATION
 # =============================================================================
 
-def suspend_new_card_siblings(group_name: str, card_ids: List[int]) -> int:
+def suspend_new_card_siblings(group_name: str, card_ids: List[int],
+                              col: Optional[Collection] = None) -> int:
     """
     Suspend all but the first new card in a sibling group.
     This enables cross-platform sibling separation since suspension syncs.
     """
-    if mw.col is None:
+    col = col or mw.col
+    if col is None:
         return 0
 
     # Get all cards and filter to new cards only
     new_cards = []
     for cid in card_ids:
         try:
-            card = mw.col.get_card(cid)
+            card = col.get_card(cid)
             if card.queue == 0 and card.type == 0:  # New card
                 new_cards.append(card)
         except Exception:
@@ -518,27 +636,23 @@ def suspend_new_card_siblings(group_name: str, card_ids: List[int]) -> int:
     # Sort by card ID for stable ordering
     new_cards.sort(key=lambda c: c.id)
 
-    # Keep the first one active, suspend the rest
-    suspended_count = 0
-    for card in new_cards[1:]:
-        try:
-            # Suspend the card
-            card.queue = -1
-            mw.col.update_card(card)
-            
-            # Add the sibling-suspended tag to track it
-            note = card.note()
-            suspended_tag = f"{SUSPENDED_TAG_PREFIX}{group_name}"
-            if suspended_tag not in note.tags:
-                note.tags.append(suspended_tag)
-                mw.col.update_note(note)
-            
-            suspended_count += 1
-            log(f"Suspended new card {card.id} in group {group_name}")
-        except Exception as e:
-            log_error(f"Error suspending card {card.id}", e)
+    # Keep the first one active, suspend the rest in a single backend call
+    to_suspend = new_cards[1:]
+    try:
+        col.sched.suspend_cards([card.id for card in to_suspend])
+    except Exception as e:
+        log_error(f"Error suspending cards in group {group_name}", e)
+        return 0
+    log(f"Suspended new cards {[card.id for card in to_suspend]} in group {group_name}")
+
+    # Add the sibling-suspended tag to track them, in a single backend call
+    suspended_tag = f"{SUSPENDED_TAG_PREFIX}{group_name}"
+    try:
+        col.tags.bulk_add(list({card.nid for card in to_suspend}), suspended_tag)
+    except Exception as e:
+        log_error(f"Error adding tag '{suspended_tag}' to notes", e)
 
-    return suspended_count
+    return len(to_suspend)
 
 
 def check_and_unsuspend_siblings() -> int:
@@ -550,18 +664,45 @@ def check_and_unsuspend_siblings() -> int:
         return 0
 
     groups = get_all_sibling_groups()
-    total_unsuspended = 0
-
-    for group_name, note_ids in groups.items():
-        # Get all cards in this group with their notes
-        all_cards_with_notes = []
+    
+    # Load each note and its cards once, even if it's in several groups.
+    # The objects are shared between groups, so changes made while processing
+    # one group are seen by the next; they are written in one batch at the end.
+    notes: Dict[int, Note] = {}
+    cards_by_note: Dict[int, List[Card]] = {}
+    for note_ids in groups.values():
         for nid in note_ids:
+            if nid in notes:
+                continue
             try:
                 note = mw.col.get_note(nid)
-                for card in note.cards():
-                    all_cards_with_notes.append((card, note))
+                cards_by_note[nid] = note.cards()
+                notes[nid] = note
             except Exception:
                 pass
+    
+    # Find which of these cards have been reviewed, in a single query
+    all_cids = [card.id for cards in cards_by_note.values() for card in cards]
+    reviewed_cids = set(mw.col.db.list(
+        f"SELECT DISTINCT cid FROM revlog WHERE cid IN {ids2str(all_cids)}"
+    ))
+    
+    # Notes still carrying a sibling-suspended tag
+    suspended_tag_nids = {
+        nid for nid, note in notes.items()
+        if any(t.startswith(SUSPENDED_TAG_PREFIX) for t in note.tags)
+    }
+    
+    cids_to_unsuspend: Set[int] = set()
+    cleared_nids: Set[int] = set()
+
+    for group_name, note_ids in groups.items():
+        # Get all cards in this group with their notes
+        all_cards_with_notes = [
+            (card, notes[nid])
+            for nid in note_ids if nid in notes
+            for card in cards_by_note[nid]
+        ]
 
         if not all_cards_with_notes:
             continue
@@ -576,122 +717,133 @@ def check_and_unsuspend_siblings() -> int:
         for card, note in all_cards_with_notes:
             # Check if this card is a sibling-suspended card
             is_suspended_sibling = (
-                card.queue == -1 and
-                any(t.startswith(SUSPENDED_TAG_PREFIX) for t in note.tags)
+                card.queue == -1 and note.id in suspended_tag_nids
             )
 
             if is_suspended_sibling:
                 if previous_all_reviewed and not unsuspended_one:
                     # Unsuspend this one card
                     card.queue = 0  # Back to new
-                    mw.col.update_card(card)
+                    cids_to_unsuspend.add(card.id)
                     
                     # Remove the sibling-suspended tag from this note
-                    note.tags = [t for t in note.tags if not t.startswith(SUSPENDED_TAG_PREFIX)]
-                    mw.col.update_note(note)
+                    suspended_tag_nids.discard(note.id)
+                    cleared_nids.add(note.id)
                     
-                    total_unsuspended += 1
                     unsuspended_one = True
                     log(f"Unsuspended sibling card {card.id} in group {group_name}")
                 # Don't break - continue to check if there are more suspended siblings
             else:
                 # This is an active (non-suspended) sibling
                 # Check if it has been reviewed
-                has_reviews = mw.col.db.scalar(
-                    "SELECT COUNT() FROM revlog WHERE cid = ?", card.id
-                )
-                if has_reviews == 0 and card.type == 0:
+                if card.id not in reviewed_cids and card.type == 0:
                     # This card hasn't been reviewed yet - don't unsuspend the next one
                     previous_all_reviewed = False
 
-    return total_unsuspended
+    if cids_to_unsuspend:
+        mw.col.sched.unsuspend_cards(list(cids_to_unsuspend))
+        
+        # Strip the sibling-suspended tags in a single backend call
+        suspended_tags = {
+            t for nid in cleared_nids for t in notes[nid].tags
+            if t.startswith(SUSPENDED_TAG_PREFIX)
+        }
+        mw.col.tags.bulk_remove(list(cleared_nids), " ".join(suspended_tags))
+
+    return len(cids_to_unsuspend)
 
 
-def spread_review_card_due_dates(group_name: str, min_gap_days: int = 1) -> int:
+def spread_review_card_due_dates(group_name: str, min_gap_days: int = 1,
+                                 col: Optional[Collection] = None) -> int:
     """
     Spread review cards in a sibling group across consecutive days.
     This ensures review siblings are never due on the same day.
     """
-    if mw.col is None:
+    col = col or mw.col
+    if col is None:
         return 0
 
     tag = get_sibling_tag(group_name)
-    note_ids = mw.col.find_notes(f"tag:{tag}")
-    today = mw.col.sched.today
-
-    # Collect all review cards due today or earlier
-    review_cards_due = []
-    for nid in note_ids:
-        try:
-            note = mw.col.get_note(nid)
-            for card in note.cards():
-                # Review cards due today or overdue
-                if card.queue == 2 and card.due <= today:
-                    review_cards_due.append(card)
-        except Exception:
-            pass
+    today = col.sched.today
+
+    # Collect all review cards due today or overdue in one query,
+    # sorted by due date, then by card ID for stability
+    review_cards_due = col.db.all(
+        "SELECT c.id, c.due FROM cards c JOIN notes n ON n.id = c.nid "
+        "WHERE n.tags LIKE ? ESCAPE '\\' AND c.queue = 2 AND c.due <= ? "
+        "ORDER BY c.due, c.id",
+        tag_like_pattern(tag), today
+    )
 
     if len(review_cards_due) < 2:
         return 0
 
-    # Sort by due date, then by card ID for stability
-    review_cards_due.sort(key=lambda c: (c.due, c.id))
-
-    # Keep the first one as-is, spread the rest
-    rescheduled = 0
-    for i, card in enumerate(review_cards_due[1:], start=1):
+    # Keep the first one as-is, spread the rest; only cards that actually
+    # move are loaded
+    changed: List[Card] = []
+    for i, (cid, due) in enumerate(review_cards_due[1:], start=1):
         new_due = today + (i * min_gap_days)
-        if card.due != new_due:
+        if due != new_due:
+            card = col.get_card(cid)
             card.due = new_due
-            mw.col.update_card(card)
-            rescheduled += 1
-            log(f"Rescheduled review card {card.id} to day {new_due}")
+            changed.append(card)
+            log(f"Rescheduled review card {cid} to day {new_due}")
 
-    return rescheduled
+    # Write all changed cards in a single backend call
+    if changed:
+        col.update_cards(changed)
 
+    return len(changed)
 
-def reschedule_review_siblings(card: Card, days_offset: int = 1) -> int:
+
+def reschedule_review_siblings(card: Card, days_offset: int = 1,
+                               sibling_tags: Optional[List[str]] = None) -> int:
     """
     Reschedule review siblings to tomorrow after a card is reviewed.
     This ensures the rescheduled due dates sync to mobile.
+    Pass the note's sibling tags if already known to skip looking them up.
     """
     if not card or mw.col is None:
         return 0
 
     try:
-        note = card.note()
-        sibling_tags = get_sibling_tags_for_note(note)
+        if sibling_tags is None:
+            sibling_tags = get_sibling_tags_for_note_ids({card.nid}).get(card.nid, [])
         
         if not sibling_tags:
             return 0
 
         today = mw.col.sched.today
         target_due = today + days_offset
-        rescheduled = 0
+        changed: List[Card] = []
 
+        # Get all sibling cards from all groups this card belongs to
+        sibling_cids: Set[int] = set()
         for tag in sibling_tags:
             group_name = extract_group_name(tag)
-            if not group_name:
-                continue
+            if group_name:
+                sibling_cids.update(get_cached_cards_for_sibling_group(group_name))
 
-            note_ids = mw.col.find_notes(f"tag:{tag}")
-            
-            for nid in note_ids:
-                if nid == card.nid:
-                    continue  # Skip the answered card's note
-
-                try:
-                    sibling_note = mw.col.get_note(nid)
-                    for sib_card in sibling_note.cards():
-                        # Only reschedule review cards due today or earlier
-                        if sib_card.queue == 2 and sib_card.due <= today:
-                            sib_card.due = target_due
-                            mw.col.update_card(sib_card)
-                            rescheduled += 1
-                except Exception:
-                    pass
-
-        return rescheduled
+        if not sibling_cids:
+            return 0
+
+        # Only reschedule review cards due today or earlier on other notes;
+        # only those cards are loaded
+        due_cids = mw.col.db.list(
+            f"SELECT id FROM cards WHERE id IN {ids2str(sibling_cids)} "
+            "AND nid != ? AND queue = 2 AND due <= ?",
+            card.nid, today
+        )
+        for cid in due_cids:
+            sib_card = mw.col.get_card(cid)
+            sib_card.due = target_due
+            changed.append(sib_card)
+
+        # Write all changed cards in a single backend call
+        if changed:
+            mw.col.update_cards(changed)
+
+        return len(changed)
 
     except Exception as e:
         log_error("Error in reschedule_review_siblings", e)
@@ -707,29 +859,44 @@ def enforce_sibling_separation() -> int:
     if mw.col is None:
         return 0
 
-    groups = get_all_sibling_groups()
+    # Count due review cards per group in one query; only groups with at
+    # least two of them can need spreading, so most loads skip the loop
+    due_counts: Dict[str, int] = defaultdict(int)
+    tag_strings = mw.col.db.list(
+        "SELECT n.tags FROM cards c JOIN notes n ON n.id = c.nid "
+        "WHERE c.queue = 2 AND c.due <= ? AND n.tags LIKE ?",
+        mw.col.sched.today, f"% {TAG_PREFIX}%"
+    )
+    for tags in tag_strings:
+        for tag in tags.split():
+            group_name = extract_group_name(tag)
+            if group_name:
+                due_counts[group_name] += 1
+
     total_rescheduled = 0
 
-    for group_name in groups.keys():
-        rescheduled = spread_review_card_due_dates(group_name)
-        total_rescheduled += rescheduled
+    for group_name, due_count in due_counts.items():
+        if due_count >= 2:
+            rescheduled = spread_review_card_due_dates(group_name)
+            total_rescheduled += rescheduled
 
     return total_rescheduled
 
 
-def apply_sibling_separation(group_name: str, card_ids: List[int]) -> None:
+def apply_sibling_separation(group_name: str, card_ids: List[int],
+                             col: Optional[Collection] = None) -> None:
     """
     Apply sibling separation for a newly marked group.
     - Suspends new card siblings (all but first)
     - Spreads review card due dates
     """
     # Handle new cards: suspend all but the first
-    suspended = suspend_new_card_siblings(group_name, card_ids)
+    suspended = suspend_new_card_siblings(group_name, card_ids, col)
     if suspended > 0:
         log(f"Suspended {suspended} new card siblings in group {group_name}")
 
     # Handle review cards: spread due dates
-    spread = spread_review_card_due_dates(group_name)
+    spread = spread_review_card_due_dates(group_name, col=col)
     if spread > 0:
         log(f"Spread {spread} review card due dates in group {group_name}")
 
@@ -743,6 +910,16 @@ def get_legacy_config_path() -> str:
     addon_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(addon_dir, "user_files", "sibling_groups.json")
 
+def parse_legacy_card_ids(card_ids: list) -> List[int]:
+    """Convert legacy card IDs to ints, skipping any that are malformed."""
+    parsed = []
+    for cid in card_ids:
+        try:
+            parsed.append(int(cid))
+        except (TypeError, ValueError):
+            log(f"Skipping malformed legacy card ID {cid!r}", "WARN")
+    return parsed
+
 def migrate_from_json() -> bool:
     """
     Migrate sibling groups from old JSON storage to tags.
@@ -771,35 +948,50 @@ def migrate_from_json() -> bool:
         migrated_groups = 0
         migrated_notes = 0
         
-        for group_id, card_ids in groups.items():
-            # Sanitize group name for tag
-            tag_group_name = sanitize_group_name(group_id) or generate_group_id()
-            tag = get_sibling_tag(tag_group_name)
-            
-            # Find notes for these cards and add tag
-            note_ids_for_group: Set[int] = set()
-            
-            for cid in card_ids:
-                try:
-                    card = mw.col.get_card(cid)
-                    note_ids_for_group.add(card.nid)
-                except Exception:
-                    # Card might have been deleted
-                    pass
-            
-            # Add tag to each note
-            for nid in note_ids_for_group:
-                try:
-                    note = mw.col.get_note(nid)
-                    if tag not in note.tags:
-                        note.tags.append(tag)
-                        mw.col.update_note(note)
-                        migrated_notes += 1
-                except Exception as e:
-                    log_error(f"Error migrating note {nid}", e)
+        # Resolve all legacy card IDs to note IDs in one query
+        # (cards that have since been deleted are simply missing)
+        cids_by_group = {
+            group_id: parse_legacy_card_ids(card_ids)
+            for group_id, card_ids in groups.items()
+        }
+        all_cids = {cid for cids in cids_by_group.values() for cid in cids}
+        cid_to_nid = dict(mw.col.db.all(
+            f"SELECT id, nid FROM cards WHERE id IN {ids2str(all_cids)}"
+        ))
+        nids_by_group = {
+            group_id: {cid_to_nid[cid] for cid in cids if cid in cid_to_nid}
+            for group_id, cids in cids_by_group.items()
+        }
+        
+        # Sanitize group names for tags up front
+        tags_by_group = {
+            group_id: get_sibling_tag(resolve_group_name(group_id))
+            for group_id in groups
+        }
+        
+        # Group all tag writes under a single undo entry, if there are any
+        undo_entry = None
+        if any(nids_by_group.values()):
+            undo_entry = mw.col.add_custom_undo_entry("Migrate Sibling Groups")
+        
+        for group_id, note_ids_for_group in nids_by_group.items():
+            if not note_ids_for_group:
+                continue
+            tag = tags_by_group[group_id]
             
-            if note_ids_for_group:
+            # Add tag to all notes in the group in a single backend call
+            try:
+                migrated_notes += mw.col.tags.bulk_add(
+                    list(note_ids_for_group), tag
+                ).count
                 migrated_groups += 1
+            except Exception as e:
+                log_error(f"Error migrating group {group_id}", e)
+        
+        if undo_entry is not None:
+            mw.col.merge_undo_entries(undo_entry)
+        # Direct backend writes don't fire operation_did_execute
+        invalidate_group_cache()
         
         # Rename the old file to mark as migrated
         os.rename(legacy_path, legacy_path + ".migrated")
@@ -824,26 +1016,51 @@ def migrate_from_json() -> bool:
 def on_reviewer_did_answer_card(reviewer, card, ease) -> None:
     """Hook called when a card is answered."""
     try:
-        buried = bury_custom_siblings(card)
+        # Most answered cards aren't in any group; skip them without a DB hit
+        if card.nid not in get_all_sibling_note_ids():
+            return
+        
+        # Read the note's sibling tags once for both passes
+        sibling_tags = get_sibling_tags_for_note_ids({card.nid}).get(card.nid, [])
+        
+        buried = bury_custom_siblings(card, sibling_tags)
         if buried > 0:
             tooltip(f"Buried {buried} custom sibling(s)")
         
         # Also reschedule review siblings for cross-platform sync
-        rescheduled = reschedule_review_siblings(card)
+        rescheduled = reschedule_review_siblings(card, sibling_tags=sibling_tags)
         if rescheduled > 0:
             log(f"Rescheduled {rescheduled} review sibling(s) for sync")
     except Exception as e:
         log_error("Error in reviewer hook", e)
 
+def on_operation_did_execute(changes, handler) -> None:
+    """Drop cached group membership when notes, tags or note types change.
+    Note type changes matter because adding a template creates new cards."""
+    if changes.note_text or changes.tag or changes.notetype:
+        invalidate_group_cache()
+
 def on_sync_did_finish() -> None:
     """Called after sync completes - check for mobile reviews."""
-    try:
-        buried = process_reviews_since_last_check()
-        if buried > 0:
-            tooltip(f"Buried {buried} sibling(s) from synced reviews")
-            log(f"Post-sync: buried {buried} siblings")
-    except Exception as e:
-        log_error("Error in sync hook", e)
+    # Synced notes may have gained or lost sibling tags
+    invalidate_group_cache()
+    if mw.col is None:
+        return
+    
+    def on_success(changes: OpChangesWithCount) -> None:
+        if changes.count > 0:
+            tooltip(f"Buried {changes.count} sibling(s) from synced reviews")
+            log(f"Post-sync: buried {changes.count} siblings")
+    
+    # Scan the revlog off the UI thread so large syncs don't freeze it; the
+    # returned changes refresh the main window like any other operation
+    CollectionOp(
+        parent=mw, op=process_reviews_since_last_check
+    ).success(
+        on_success
+    ).failure(
+        lambda e: log_error(f"Error in sync hook: {e}")
+    ).run_in_background()
 
 def on_browser_context_menu(browser: Browser, menu: QMenu) -> None:
     """Add sibling marker options to browser context menu."""
@@ -893,9 +1110,9 @@ def show_all_groups() -> None:
         showInfo("Please open a collection first.")
         return
     
-    groups = get_all_sibling_groups()
+    group_counts = get_sibling_group_counts()
     
-    if not groups:
+    if not group_counts:
         showInfo("No sibling groups defined yet.\n\n"
                 "Use the Browser to select cards, then right-click -> "
                 "Sibling Marker -> Mark as Siblings")
@@ -904,11 +1121,11 @@ def show_all_groups() -> None:
     lines = ["Sibling Groups:\n"]
     total_notes = 0
     
-    for group_name, note_ids in sorted(groups.items()):
-        lines.append(f"  {TAG_PREFIX}{group_name}: {len(note_ids)} notes")
-        total_notes += len(note_ids)
+    for group_name, count in sorted(group_counts.items()):
+        lines.append(f"  {TAG_PREFIX}{group_name}: {count} notes")
+        total_notes += count
     
-    lines.append(f"\nTotal: {len(groups)} groups, {total_notes} notes")
+    lines.append(f"\nTotal: {len(group_counts)} groups, {total_notes} notes")
     lines.append("\nTip: Groups are stored as tags - view them in the tag sidebar!")
     
     showInfo("\n".join(lines), title="Sibling Marker - All Groups")
@@ -927,6 +1144,7 @@ def setup_menu() -> None:
 
 def on_profile_loaded() -> None:
     """Called when a profile is loaded - run migration and check siblings."""
+    invalidate_group_cache()
     migrate_from_json()
     
     # Initialize last check time if not set (so we don't process old reviews)
@@ -934,6 +1152,8 @@ def on_profile_loaded() -> None:
         import time
         set_last_sync_check_time(int(time.time() * 1000))
     
+    # Runs on the main thread so it finishes before the profile's auto-sync
+    # starts, and the sync uploads the unsuspended / rescheduled cards.
     # Check if any suspended siblings should be unsuspended
     unsuspended = check_and_unsuspend_siblings()
     if unsuspended > 0:
@@ -950,10 +1170,19 @@ def on_profile_loaded() -> None:
 # REGISTER HOOKS
 # =============================================================================
 
-gui_hooks.browser_will_show_context_menu.append(on_browser_context_menu)
-gui_hooks.reviewer_did_answer_card.append(on_reviewer_did_answer_card)
-gui_hooks.main_window_did_init.append(setup_menu)
-gui_hooks.profile_did_open.append(on_profile_loaded)
-gui_hooks.sync_did_finish.append(on_sync_did_finish)
-
-log("Sibling Marker addon loaded (v2.0 - tag-based sync)")
+# Only one copy of the addon may register hooks; a second copy (e.g. a
+# development checkout next to the installed package) would otherwise bury
+# and reschedule every answered card's siblings twice.
+if getattr(mw, "_sibling_marker_hooks_registered", False):
+    log("Another copy of Sibling Marker is already loaded; skipping hooks", "WARN")
+else:
+    mw._sibling_marker_hooks_registered = True
+    
+    gui_hooks.browser_will_show_context_menu.append(on_browser_context_menu)
+    gui_hooks.reviewer_did_answer_card.append(on_reviewer_did_answer_card)
+    gui_hooks.main_window_did_init.append(setup_menu)
+    gui_hooks.profile_did_open.append(on_profile_loaded)
+    gui_hooks.sync_did_finish.append(on_sync_did_finish)
+    gui_hooks.operation_did_execute.append(on_operation_did_execute)
+    
+    log("Sibling Marker addon loaded (v2.0 - tag-based sync)")